@@ -3,15 +3,24 @@ import os
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
+# BigQuery client reused across warm Lambda invocations
+_BQ_CLIENT = None
+
+def _get_client():
+    """Build the BigQuery client from the service account key once per container"""
+    global _BQ_CLIENT
+    if _BQ_CLIENT is None:
+        credentials_info = json.loads(os.environ['GCP_SERVICE_ACCOUNT_KEY'])
+        credentials = service_account.Credentials.from_service_account_info(credentials_info)
+        _BQ_CLIENT = bigquery.Client(credentials=credentials, project=credentials_info['project_id'])
+    return _BQ_CLIENT
+
 def lambda_handler(event, context):
     """
     AWS Lambda function to scan contracts and process payments
     """
     
-    # Initialize BigQuery client with service account
-    credentials_info = json.loads(os.environ['GCP_SERVICE_ACCOUNT_KEY'])
-    credentials = service_account.Credentials.from_service_account_info(credentials_info)
-    client = bigquery.Client(credentials=credentials, project=credentials_info['project_id'])
+    client = _get_client()
     
     if event.get('action') == 'scan_contracts':
         return scan_contracts(client)
@@ -21,36 +30,33 @@ def lambda_handler(event, context):
         return scan_and_process_all(client)
 
 def scan_contracts(client):
-    """Scan for contracts ready for payment"""
+    """Scan for contracts ready for payment and queue them in a single statement"""
     
     query = """
-    SELECT 
-        c.contract_id,
-        COALESCE(c.final_amount, c.total_fee) as amount,
-        c.currency,
-        COUNT(pmo.post_id) as posts_completed,
-        c.post_required,
-        c.compliance
-    FROM `proof-of-brand.social_media_metrics.contract` c
-    LEFT JOIN `proof-of-brand.social_media_metrics.post_metrics_objectives` pmo ON c.contract_id = pmo.contract_id
-    WHERE c.payment_status = 'Pending'
-    AND c.contract_status = 'active'
-    AND c.contract_id NOT IN (SELECT contract_id FROM `proof-of-brand.social_media_metrics.payment_queue` WHERE status != 'FAILED')
-    GROUP BY c.contract_id, c.total_fee, c.final_amount, c.currency, c.post_required, c.payment_due_days, c.compliance
-    HAVING COUNT(pmo.post_id) >= c.post_required
-    AND DATE_ADD(MAX(pmo.actual_post_date), INTERVAL c.payment_due_days DAY) <= CURRENT_DATE()
+    INSERT INTO `proof-of-brand.social_media_metrics.payment_queue` (contract_id, amount, currency, status, created_at)
+    SELECT contract_id, amount, currency, 'PENDING', CURRENT_DATETIME()
+    FROM (
+        SELECT 
+            c.contract_id,
+            COALESCE(c.final_amount, c.total_fee) as amount,
+            c.currency,
+            COUNT(pmo.post_id) as posts_completed,
+            c.post_required,
+            c.compliance
+        FROM `proof-of-brand.social_media_metrics.contract` c
+        LEFT JOIN `proof-of-brand.social_media_metrics.post_metrics_objectives` pmo ON c.contract_id = pmo.contract_id
+        WHERE c.payment_status = 'Pending'
+        AND c.contract_status = 'active'
+        AND c.contract_id NOT IN (SELECT contract_id FROM `proof-of-brand.social_media_metrics.payment_queue` WHERE status != 'FAILED')
+        GROUP BY c.contract_id, c.total_fee, c.final_amount, c.currency, c.post_required, c.payment_due_days, c.compliance
+        HAVING COUNT(pmo.post_id) >= c.post_required
+        AND DATE_ADD(MAX(pmo.actual_post_date), INTERVAL c.payment_due_days DAY) <= CURRENT_DATE()
+    )
     """
     
-    contracts = client.query(query).result()
-    
-    processed_count = 0
-    for contract in contracts:
-        insert_query = f"""
-        INSERT INTO `proof-of-brand.social_media_metrics.payment_queue` (contract_id, amount, currency, status, created_at)
-        VALUES ('{contract.contract_id}', {contract.amount}, '{contract.currency}', 'PENDING', CURRENT_DATETIME())
-        """
-        client.query(insert_query)
-        processed_count += 1
+    insert_job = client.query(query)
+    insert_job.result()
+    processed_count = insert_job.num_dml_affected_rows or 0
     
     return {
         'statusCode': 200,
@@ -73,23 +79,16 @@ def process_payments(client):
     
     payments = client.query(query).result()
     
-    processed_count = 0
-    for payment in payments:
-        success = call_payment_service(payment.contract_id, payment.amount, payment.currency)
-        
-        if success:
-            client.query(f"""
-            UPDATE `proof-of-brand.social_media_metrics.payment_queue`
-            SET status = 'COMPLETED', processed_at = CURRENT_DATETIME()
-            WHERE contract_id = '{payment.contract_id}'
-            """)
-            
-            client.query(f"""
-            UPDATE `proof-of-brand.social_media_metrics.contract`
-            SET payment_status = 'Paid'
-            WHERE contract_id = '{payment.contract_id}'
-            """)
-            processed_count += 1
+    succeeded_ids = []
+    try:
+        for payment in payments:
+            if call_payment_service(payment.contract_id, payment.amount, payment.currency):
+                succeeded_ids.append(payment.contract_id)
+    finally:
+        # Record whatever was paid, even if a later payment raised, so nothing is paid twice
+        mark_payments_completed(client, succeeded_ids)
+    
+    processed_count = len(succeeded_ids)
     
     return {
         'statusCode': 200,
@@ -99,6 +98,28 @@ def process_payments(client):
         })
     }
 
+def mark_payments_completed(client, contract_ids):
+    """Mark every successful payment in one job instead of two UPDATEs per payment"""
+    
+    if not contract_ids:
+        return
+    
+    update_query = """
+    MERGE `proof-of-brand.social_media_metrics.payment_queue` q
+    USING (SELECT DISTINCT contract_id FROM UNNEST(@contract_ids) AS contract_id) s
+    ON q.contract_id = s.contract_id
+    WHEN MATCHED THEN
+        UPDATE SET status = 'COMPLETED', processed_at = CURRENT_DATETIME();
+    
+    UPDATE `proof-of-brand.social_media_metrics.contract`
+    SET payment_status = 'Paid'
+    WHERE contract_id IN UNNEST(@contract_ids);
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ArrayQueryParameter('contract_ids', 'STRING', contract_ids)]
+    )
+    client.query(update_query, job_config=job_config).result()
+
 def scan_and_process_all(client):
     """Combined function for simplicity"""
     scan_result = scan_contracts(client)